@@ -4,103 +4,238 @@ Healthcare Conference Deep Research Tool
 Uses Gemini AI to find comprehensive, up-to-date conference information
 """
 
+import argparse
 import asyncio
+import hashlib
 import os
-from dotenv import load_dotenv
-try:
-    import google.generativeai as genai
-except ImportError:
-    print("❌ Google Generative AI package not installed.")
-    print("Please install it with: pip install google-generativeai")
-    exit(1)
-
-# Load environment variables
-load_dotenv()
-
-async def deep_research_conferences():
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Final, List, Optional
+import orjson
+from medahead_gemini import MODEL_NAME, get_model, require_api_key
+from medahead_loop import install_uvloop
+
+DEEP_RESEARCH_INSTRUCTION: Final = """You are an expert healthcare conference researcher with access to comprehensive industry knowledge. 
+    You specialize in finding current, accurate, and detailed information about major healthcare conferences, 
+    including exact dates, locations, attendee counts, and industry focus areas. 
+    
+    Your research should be thorough, current, and include:
+    - Official conference dates and locations for 2024-2025
+    - Expected attendee numbers
+    - Key focus areas and themes
+    - Target audiences and industries
+    - Registration and networking opportunities
+    
+    Always provide factual, up-to-date information and clearly indicate your confidence level in the data.
+    Format responses in clear, structured JSON when possible for easy parsing."""
+
+DEEP_RESEARCH_PROMPT: Final = """
+    Please conduct comprehensive research on major healthcare conferences for 2024-2025. 
+    Focus on finding the most current and accurate information for these key conferences:
+
+    1. HIMSS Global Health Conference & Exhibition 2025
+    2. J.P. Morgan Healthcare Conference 2025
+    3. BIO International Convention 2025
+    4. American Hospital Association (AHA) Annual Meeting 2025
+    5. American College of Physicians (ACP) Internal Medicine Meeting 2025
+    6. Radiological Society of North America (RSNA) Annual Meeting 2024
+    7. Healthcare Financial Management Association (HFMA) Annual Conference 2025
+    8. American Medical Association (AMA) Annual Meeting 2025
+    9. Digital Health Summit 2025
+    10. Any other major healthcare conferences in 2024-2025
+
+    For each conference, please provide:
+    - Conference name and year
+    - Exact dates (month and specific days)
+    - Location (city, state, venue if known)
+    - Expected number of attendees
+    - Primary focus areas and themes
+    - Target audience/industries
+    - Brief description of significance in the healthcare industry
+    - Website or registration information if available
+
+    Please format the response as a well-structured JSON array that can be easily parsed.
+    Ensure all dates are realistic and current for 2024-2025.
+    Include your confidence level for each piece of information (High/Medium/Low).
+    """
+
+TARGETED_RESEARCH_INSTRUCTION: Final = """You are a healthcare conference research specialist. 
+    Provide detailed, accurate information about specific healthcare conferences or topics.
+    Focus on current 2024-2025 information."""
+
+TARGETED_RESEARCH_TEMPLATE: Final = "Research and provide detailed information about: {query}"
+
+BATCH_RESEARCH_HEADER: Final = (
+    "For each of the following queries, research and provide detailed information.\n"
+    "Return a JSON object keyed by the query index whose values are the answers as text.\n"
+)
+
+DEFAULT_OUTPUT_PATH = Path("conference_research_results.txt")
+
+# Gemini responses keyed by a hash of the full request; conference data changes slowly,
+# so entries are reused for a day like the backend's research cache
+CACHE_DIR = Path.home() / ".medahead_cache"
+CACHE_TTL_SECONDS = 24 * 3600
+
+SEPARATOR_80 = "=" * 80 + "\n"
+SEPARATOR_60 = "=" * 60 + "\n"
+DEEP_RESULTS_HEADER = SEPARATOR_80 + "HEALTHCARE CONFERENCE DEEP RESEARCH RESULTS\n" + SEPARATOR_80
+RESULTS_FILE_HEADER = (
+    b"Healthcare Conference Deep Research Results\n"
+    b"Generated using Gemini AI - December 2024\n"
+    + b"=" * 80 + b"\n\n"
+)
+TOOL_BANNER = "🚀 Healthcare Conference Deep Research Tool\n" + "=" * 50 + "\n"
+API_KEY_HELP = "\n".join([
+    "",
+    "⚠️  To use this tool, you need to set your GEMINI_API_KEY environment variable.",
+    "You can do this by:",
+    "1. Creating a .env file with: GEMINI_API_KEY=your_api_key_here",
+    "2. Or running: export GEMINI_API_KEY=your_api_key_here",
+    "",
+    "Get your API key from: https://aistudio.google.com/app/apikey",
+    ""
+])
+
+# Markdown code fences Gemini wraps around JSON output
+CODE_FENCE_PATTERN = re.compile(r"^\s*```(?:json)?\s*|\s*```\s*$")
+
+# Separates the deep and targeted sections when both are requested in one prompt
+TARGETED_SECTION_MARKER: Final = "=== TARGETED RESEARCH ==="
+
+# Targeted follow-up appended to the deep prompt, specialized per query. The deep prompt
+# stays out of the template so braces in it never reach format_map
+COMBINED_SUFFIX_TEMPLATE: Final = (
+    f"\n    After the JSON array, output a line containing exactly {TARGETED_SECTION_MARKER}\n"
+    "    and then research and provide detailed information about: {query}\n"
+)
+
+def cache_file_for(system_instruction: str, prompt: str) -> Path:
+    """Return the cache file that stores the response for this request"""
+    key = hashlib.sha256(f"{MODEL_NAME}\0{system_instruction}\0{prompt}".encode()).hexdigest()
+    return CACHE_DIR / f"{key}.txt"
+
+def read_cache_file(cache_file: Path) -> Optional[str]:
+    """Return a cached response, or None if it is missing or older than the TTL"""
+    try:
+        if time.time() - cache_file.stat().st_mtime > CACHE_TTL_SECONDS:
+            return None
+        return cache_file.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return None
+
+def write_cache_file(cache_file: Path, research_results: str):
+    """Write a cache entry atomically so interrupted or parallel runs never see a partial file"""
+    CACHE_DIR.mkdir(exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(research_results)
+        os.replace(temp_path, cache_file)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+async def load_cached(cache_file: Path, use_cache: bool) -> Optional[str]:
+    """Read a fresh cache entry without blocking the event loop"""
+    if not use_cache:
+        return None
+    return await asyncio.to_thread(read_cache_file, cache_file)
+
+async def store_cached(cache_file: Path, research_results: str):
+    """Persist a Gemini response to the cache"""
+    await asyncio.to_thread(write_cache_file, cache_file, research_results)
+
+def targeted_prompt(query: str) -> str:
+    """Build the prompt for a single targeted research query"""
+    return TARGETED_RESEARCH_TEMPLATE.format_map({"query": query})
+
+async def cached_generate(system_instruction: str, prompt: str, use_cache: bool = True, stream: bool = False) -> str:
+    """Return Gemini's response text, reusing the stored answer for an identical request"""
+    cache_file = cache_file_for(system_instruction, prompt)
+    
+    research_results = await load_cached(cache_file, use_cache)
+    if research_results is not None:
+        print("♻️  Using cached Gemini response")
+        if stream:
+            sys.stdout.write(research_results)
+        return research_results
+    
+    model = get_model(system_instruction)
+    if stream:
+        # Echo chunks as they arrive instead of waiting for the full completion
+        chunks = []
+        async for chunk in await model.generate_content_async(prompt, stream=True):
+            sys.stdout.write(chunk.text)
+            sys.stdout.flush()
+            chunks.append(chunk.text)
+        research_results = "".join(chunks)
+    else:
+        research_results = (await model.generate_content_async(prompt)).text
+    
+    await store_cached(cache_file, research_results)
+    return research_results
+
+def parse_research_json(research_results: str):
+    """Parse Gemini's JSON output, or return None if it is not valid JSON"""
+    try:
+        return orjson.loads(CODE_FENCE_PATTERN.sub("", research_results))
+    except orjson.JSONDecodeError:
+        return None
+
+def save_deep_results(research_results: str, output_path: Path = DEFAULT_OUTPUT_PATH):
+    """Save deep research results to file"""
+    data = parse_research_json(research_results)
+    if data is not None:
+        body = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        print("⚠️  Response was not valid JSON, saving raw text")
+        body = research_results.encode("utf-8")
+    
+    # orjson already produces bytes; the buffered writer retries short writes
+    with open(output_path, 'wb') as f:
+        f.write(RESULTS_FILE_HEADER + body)
+    
+    print(f"\n📄 Results saved to: {output_path}")
+
+async def report_deep_results(research_results: str, output_path: Path = DEFAULT_OUTPUT_PATH):
+    """Print deep research results and save them to file"""
+    sys.stdout.write(
+        "✅ Research completed! Here are the results:\n\n"
+        + DEEP_RESULTS_HEADER + research_results + "\n" + SEPARATOR_80
+    )
+    
+    await asyncio.to_thread(save_deep_results, research_results, output_path)
+
+async def deep_research_conferences(
+    use_cache: bool = True, output_path: Path = DEFAULT_OUTPUT_PATH, stream: bool = True
+):
     """Use Gemini AI to perform deep research on healthcare conferences"""
     
-    # Get API key from environment
-    api_key = os.getenv("GEMINI_API_KEY")
-    if not api_key:
-        print("❌ Error: GEMINI_API_KEY not found in environment variables")
-        print("Please set your Gemini API key in the environment or .env file")
-        return
+    require_api_key()
     
     try:
-        # Configure Gemini AI
-        genai.configure(api_key=api_key)
-        
-        # Initialize the model
-        model = genai.GenerativeModel(
-            model_name="gemini-1.5-pro",
-            system_instruction="""You are an expert healthcare conference researcher with access to comprehensive industry knowledge. 
-            You specialize in finding current, accurate, and detailed information about major healthcare conferences, 
-            including exact dates, locations, attendee counts, and industry focus areas. 
-            
-            Your research should be thorough, current, and include:
-            - Official conference dates and locations for 2024-2025
-            - Expected attendee numbers
-            - Key focus areas and themes
-            - Target audiences and industries
-            - Registration and networking opportunities
-            
-            Always provide factual, up-to-date information and clearly indicate your confidence level in the data.
-            Format responses in clear, structured JSON when possible for easy parsing."""
+        sys.stdout.write(
+            "🔍 Starting deep research on healthcare conferences...\n"
+            "Using Gemini AI to find comprehensive conference information...\n\n"
         )
         
-        research_prompt = """
-        Please conduct comprehensive research on major healthcare conferences for 2024-2025. 
-        Focus on finding the most current and accurate information for these key conferences:
-
-        1. HIMSS Global Health Conference & Exhibition 2025
-        2. J.P. Morgan Healthcare Conference 2025
-        3. BIO International Convention 2025
-        4. American Hospital Association (AHA) Annual Meeting 2025
-        5. American College of Physicians (ACP) Internal Medicine Meeting 2025
-        6. Radiological Society of North America (RSNA) Annual Meeting 2024
-        7. Healthcare Financial Management Association (HFMA) Annual Conference 2025
-        8. American Medical Association (AMA) Annual Meeting 2025
-        9. Digital Health Summit 2025
-        10. Any other major healthcare conferences in 2024-2025
-
-        For each conference, please provide:
-        - Conference name and year
-        - Exact dates (month and specific days)
-        - Location (city, state, venue if known)
-        - Expected number of attendees
-        - Primary focus areas and themes
-        - Target audience/industries
-        - Brief description of significance in the healthcare industry
-        - Website or registration information if available
-
-        Please format the response as a well-structured JSON array that can be easily parsed.
-        Ensure all dates are realistic and current for 2024-2025.
-        Include your confidence level for each piece of information (High/Medium/Low).
-        """
-        
-        print("🔍 Starting deep research on healthcare conferences...")
-        print("Using Gemini AI to find comprehensive conference information...\n")
-        
-        # Generate response
-        response = model.generate_content(research_prompt)
-        research_results = response.text
-        
-        print("✅ Research completed! Here are the results:\n")
-        print("=" * 80)
-        print("HEALTHCARE CONFERENCE DEEP RESEARCH RESULTS")
-        print("=" * 80)
-        print(research_results)
-        print("=" * 80)
-        
-        # Save results to file
-        with open('/Users/ronitbhatia/Desktop/MedAhead/MedAheadEmergent/conference_research_results.txt', 'w') as f:
-            f.write("Healthcare Conference Deep Research Results\n")
-            f.write("Generated using Gemini AI - December 2024\n")
-            f.write("=" * 80 + "\n\n")
-            f.write(research_results)
+        if not stream:
+            # Print in one block so output from concurrent research stays readable
+            research_results = await cached_generate(DEEP_RESEARCH_INSTRUCTION, DEEP_RESEARCH_PROMPT, use_cache)
+            await report_deep_results(research_results, output_path)
+            return research_results
         
-        print(f"\n📄 Results saved to: conference_research_results.txt")
+        # Stream the response straight to the terminal
+        sys.stdout.write(DEEP_RESULTS_HEADER)
+        research_results = await cached_generate(DEEP_RESEARCH_INSTRUCTION, DEEP_RESEARCH_PROMPT, use_cache, stream=True)
+        
+        sys.stdout.write("\n" + SEPARATOR_80 + "✅ Research completed!\n")
+        
+        await asyncio.to_thread(save_deep_results, research_results, output_path)
         
         return research_results
         
@@ -109,63 +244,152 @@ async def deep_research_conferences():
         print("Please check your API key and internet connection.")
         return None
 
-async def targeted_research(query: str):
+async def targeted_research_batch(queries: List[str], use_cache: bool = True) -> Dict[int, str]:
+    """Research several targeted queries with at most one Gemini request"""
+    require_api_key()
+    results = {}
+    pending = []
+    
+    # Answer already-seen queries from the cache and only send the rest
+    for index, query in enumerate(queries):
+        cache_file = cache_file_for(TARGETED_RESEARCH_INSTRUCTION, targeted_prompt(query))
+        cached = await load_cached(cache_file, use_cache)
+        if cached is not None:
+            print(f"♻️  Using cached Gemini response for: {query}")
+            results[index] = cached
+        else:
+            pending.append(index)
+    
+    # A lone query keeps the plain single-query prompt and its free-form answer
+    missing = pending
+    if len(pending) > 1:
+        batch_prompt = BATCH_RESEARCH_HEADER + "\n".join(f"[{index}] {queries[index]}" for index in pending)
+        response = await get_model(TARGETED_RESEARCH_INSTRUCTION).generate_content_async(
+            batch_prompt, generation_config={"response_mime_type": "application/json"}
+        )
+        answers = parse_research_json(response.text)
+        if not isinstance(answers, dict):
+            print("⚠️  Batch response was not a JSON object, researching each query separately")
+            answers = {}
+        
+        # Store each answer under its single-query key so later lookups hit
+        missing = []
+        for index in pending:
+            answer = answers.get(str(index))
+            if not answer:
+                missing.append(index)
+                continue
+            if not isinstance(answer, str):
+                answer = orjson.dumps(answer, option=orjson.OPT_INDENT_2).decode()
+            results[index] = answer
+            await store_cached(
+                cache_file_for(TARGETED_RESEARCH_INSTRUCTION, targeted_prompt(queries[index])), answer
+            )
+    
+    # Queries the batch could not answer fall back to concurrent single-query requests
+    if missing:
+        answers = await asyncio.gather(*(
+            cached_generate(TARGETED_RESEARCH_INSTRUCTION, targeted_prompt(queries[index]), use_cache=False)
+            for index in missing
+        ))
+        results.update(zip(missing, answers))
+    
+    return results
+
+async def targeted_research(query: str, use_cache: bool = True):
     """Perform targeted research based on specific query"""
     
-    api_key = os.getenv("GEMINI_API_KEY")
-    if not api_key:
-        print("❌ Error: GEMINI_API_KEY not found")
-        return
+    require_api_key()
     
     try:
-        genai.configure(api_key=api_key)
+        research_results = (await targeted_research_batch([query], use_cache))[0]
         
-        model = genai.GenerativeModel(
-            model_name="gemini-1.5-pro",
-            system_instruction="""You are a healthcare conference research specialist. 
-            Provide detailed, accurate information about specific healthcare conferences or topics.
-            Focus on current 2024-2025 information."""
+        sys.stdout.write(
+            f"🎯 Targeted Research Results for: {query}\n"
+            + SEPARATOR_60 + research_results + "\n" + SEPARATOR_60
         )
         
-        research_prompt = f"Research and provide detailed information about: {query}"
-        response = model.generate_content(research_prompt)
-        research_results = response.text
-        
-        print(f"🎯 Targeted Research Results for: {query}")
-        print("=" * 60)
-        print(research_results)
-        print("=" * 60)
-        
         return research_results
         
     except Exception as e:
         print(f"❌ Targeted research failed: {str(e)}")
         return None
 
+async def combined_research(query: str, use_cache: bool = True, output_path: Path = DEFAULT_OUTPUT_PATH):
+    """Run deep and targeted research in a single Gemini request"""
+    
+    require_api_key()
+    
+    try:
+        # Ask for both sections in one prompt so we pay a single round-trip
+        research_prompt = DEEP_RESEARCH_PROMPT + COMBINED_SUFFIX_TEMPLATE.format_map({"query": query})
+        
+        print("🔍 Starting deep and targeted research in a single request...\n")
+        
+        response_text = await cached_generate(DEEP_RESEARCH_INSTRUCTION, research_prompt, use_cache)
+        deep_results, _, targeted_results = response_text.partition(TARGETED_SECTION_MARKER)
+        deep_results = deep_results.strip()
+        targeted_results = targeted_results.strip()
+        
+        await report_deep_results(deep_results, output_path)
+        
+        sys.stdout.write(
+            f"\n🎯 Targeted Research Results for: {query}\n"
+            + SEPARATOR_60 + (targeted_results or "(no targeted section returned)") + "\n" + SEPARATOR_60
+        )
+        
+        return deep_results, targeted_results
+        
+    except Exception as e:
+        print(f"❌ Combined research failed: {str(e)}")
+        return None
+
+def parse_args(argv=None):
+    """Parse command line options for a non-interactive research run"""
+    parser = argparse.ArgumentParser(description="Healthcare Conference Deep Research Tool")
+    parser.add_argument(
+        "--mode", choices=["deep", "targeted", "both", "combined"], default="deep",
+        help="deep: comprehensive conference search, targeted: specific query, "
+             "both: deep + targeted concurrently, combined: deep + targeted in a single request"
+    )
+    parser.add_argument("--query", help="research query for targeted, both and combined modes")
+    parser.add_argument(
+        "--output-path", type=Path, default=DEFAULT_OUTPUT_PATH,
+        help=f"where to save deep research results (default: {DEFAULT_OUTPUT_PATH})"
+    )
+    parser.add_argument("--no-cache", action="store_true", help="ignore cached Gemini responses")
+    
+    args = parser.parse_args(argv)
+    if args.mode != "deep" and not args.query:
+        parser.error(f"--query is required for --mode {args.mode}")
+    return args
+
+async def main(args):
+    """Run the requested research modes concurrently on one event loop"""
+    use_cache = not args.no_cache
+    tasks = []
+    
+    if args.mode == "combined":
+        tasks.append(combined_research(args.query, use_cache, args.output_path))
+    else:
+        if args.mode in ("deep", "both"):
+            # Streaming would interleave with the targeted output
+            tasks.append(deep_research_conferences(use_cache, args.output_path, stream=args.mode == "deep"))
+        if args.mode in ("targeted", "both"):
+            tasks.append(targeted_research(args.query, use_cache))
+    
+    return await asyncio.gather(*tasks)
+
 if __name__ == "__main__":
-    print("🚀 Healthcare Conference Deep Research Tool")
-    print("=" * 50)
+    args = parse_args()
+    
+    sys.stdout.write(TOOL_BANNER)
     
     # Check if API key is available
-    if not os.getenv("GEMINI_API_KEY"):
-        print("\n⚠️  To use this tool, you need to set your GEMINI_API_KEY environment variable.")
-        print("You can do this by:")
-        print("1. Creating a .env file with: GEMINI_API_KEY=your_api_key_here")
-        print("2. Or running: export GEMINI_API_KEY=your_api_key_here")
-        print("\nGet your API key from: https://aistudio.google.com/app/apikey")
+    try:
+        require_api_key()
+    except RuntimeError:
+        sys.stdout.write(API_KEY_HELP)
     else:
-        print("\n1. Deep Research (comprehensive conference search)")
-        print("2. Targeted Research (specific query)")
-        
-        choice = input("\nEnter your choice (1 or 2): ").strip()
-        
-        if choice == "1":
-            asyncio.run(deep_research_conferences())
-        elif choice == "2":
-            query = input("Enter your specific research query: ").strip()
-            if query:
-                asyncio.run(targeted_research(query))
-            else:
-                print("❌ Please provide a research query")
-        else:
-            print("❌ Invalid choice. Please run the script again.")
+        install_uvloop()
+        asyncio.run(main(args))
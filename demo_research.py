@@ -4,78 +4,92 @@ Demo script for Healthcare Conference Deep Research Tool
 Shows how to use the Gemini API for conference research
 """
 
-import os
-import google.generativeai as genai
+import argparse
+import logging
+import sys
+from typing import Final
+from medahead_gemini import get_model, require_api_key
 
-def demo_research_tool():
+DEMO_RESEARCH_INSTRUCTION: Final = """You are an expert healthcare conference researcher. 
+    Provide accurate, current information about major healthcare conferences for 2024-2025.
+    Focus on dates, locations, attendee numbers, and industry relevance."""
+
+logger = logging.getLogger(__name__)
+
+# Sample research query
+DEMO_RESEARCH_PROMPT: Final = """
+    Please provide detailed information about the top 5 healthcare conferences in 2025, including:
+    
+    1. HIMSS Global Health Conference & Exhibition 2025
+    2. J.P. Morgan Healthcare Conference 2025  
+    3. BIO International Convention 2025
+    4. American Hospital Association Annual Meeting 2025
+    5. RSNA Annual Meeting 2024
+    
+    For each conference, provide:
+    - Exact dates and location
+    - Expected attendees
+    - Key focus areas
+    - Why it's important for healthcare professionals
+    
+    Format as a clear, structured response.
+    """
+
+DEMO_TARGETED_QUERY: Final = "What are the best digital health and AI conferences for 2025?"
+
+SEPARATOR_60 = "=" * 60 + "\n"
+SEPARATOR_40 = "-" * 40 + "\n"
+DEMO_BANNER = "🚀 Healthcare Conference Deep Research Tool Demo\n" + SEPARATOR_60
+RESULTS_HEADER = SEPARATOR_60 + "HEALTHCARE CONFERENCE RESEARCH RESULTS\n" + SEPARATOR_60
+API_KEY_HELP = "\n".join([
+    "❌ GEMINI_API_KEY not found in environment variables",
+    "",
+    "💡 To use this tool:",
+    "1. Get your API key from: https://aistudio.google.com/app/apikey",
+    "2. Set it in your environment:",
+    "   export GEMINI_API_KEY='your-api-key-here'",
+    "3. Or create a .env file with: GEMINI_API_KEY=your-api-key-here",
+    ""
+])
+NEXT_STEPS = "\n".join([
+    "",
+    "💾 You can now integrate this research into your application!",
+    "📌 Next steps:",
+    "   1. Use the backend API endpoint: /api/conferences/research",
+    "   2. Update your conference database with this information",
+    "   3. Run targeted queries for specific conference details",
+    ""
+])
+
+def demo_research_tool(verbose: bool = False):
     """Demonstrate the research tool functionality"""
     
-    print("🚀 Healthcare Conference Deep Research Tool Demo")
-    print("=" * 60)
+    sys.stdout.write(DEMO_BANNER)
     
     # Check if API key is set
-    api_key = os.getenv("GEMINI_API_KEY")
-    if not api_key:
-        print("❌ GEMINI_API_KEY not found in environment variables")
-        print("\n💡 To use this tool:")
-        print("1. Get your API key from: https://aistudio.google.com/app/apikey")
-        print("2. Set it in your environment:")
-        print("   export GEMINI_API_KEY='your-api-key-here'")
-        print("3. Or create a .env file with: GEMINI_API_KEY=your-api-key-here")
-        return False
+    require_api_key()
     
     print("✅ API key found! Initializing Gemini AI...")
     
     try:
-        # Configure Gemini AI
-        genai.configure(api_key=api_key)
-        
         # Initialize the model
-        model = genai.GenerativeModel(
-            model_name="gemini-1.5-pro",
-            system_instruction="""You are an expert healthcare conference researcher. 
-            Provide accurate, current information about major healthcare conferences for 2024-2025.
-            Focus on dates, locations, attendee numbers, and industry relevance."""
-        )
+        model = get_model(DEMO_RESEARCH_INSTRUCTION)
         
         print("🧠 Model initialized successfully!")
         print("\n🔍 Running sample research query...")
         
-        # Sample research query
-        research_prompt = """
-        Please provide detailed information about the top 5 healthcare conferences in 2025, including:
-        
-        1. HIMSS Global Health Conference & Exhibition 2025
-        2. J.P. Morgan Healthcare Conference 2025  
-        3. BIO International Convention 2025
-        4. American Hospital Association Annual Meeting 2025
-        5. RSNA Annual Meeting 2024
-        
-        For each conference, provide:
-        - Exact dates and location
-        - Expected attendees
-        - Key focus areas
-        - Why it's important for healthcare professionals
-        
-        Format as a clear, structured response.
-        """
-        
-        # Generate response
-        print("⏳ Generating research results...")
-        response = model.generate_content(research_prompt)
-        
-        print("✅ Research completed!\n")
-        print("=" * 60)
-        print("HEALTHCARE CONFERENCE RESEARCH RESULTS")
-        print("=" * 60)
-        print(response.text)
-        print("=" * 60)
-        
-        print("\n💾 You can now integrate this research into your application!")
-        print("📌 Next steps:")
-        print("   1. Use the backend API endpoint: /api/conferences/research")
-        print("   2. Update your conference database with this information")
-        print("   3. Run targeted queries for specific conference details")
+        sys.stdout.write("⏳ Generating research results...\n\n")
+        if verbose:
+            # Stream the response as it is generated
+            sys.stdout.write(RESULTS_HEADER)
+            for chunk in model.generate_content(DEMO_RESEARCH_PROMPT, stream=True):
+                sys.stdout.write(chunk.text)
+                sys.stdout.flush()
+            sys.stdout.write("\n" + SEPARATOR_60)
+        else:
+            response = model.generate_content(DEMO_RESEARCH_PROMPT)
+            logger.info("Research results: %d characters (use --verbose to print)", len(response.text))
+        sys.stdout.write("✅ Research completed!\n" + NEXT_STEPS)
         
         return True
         
@@ -84,26 +98,26 @@ def demo_research_tool():
         print("Please check your API key and internet connection.")
         return False
 
-def demo_targeted_query():
+def demo_targeted_query(verbose: bool = False):
     """Demo a targeted research query"""
     
-    api_key = os.getenv("GEMINI_API_KEY")
-    if not api_key:
-        return False
+    require_api_key()
     
     try:
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel("gemini-1.5-pro")
+        model = get_model()
         
         print("\n🎯 Running targeted research query...")
         
-        query = "What are the best digital health and AI conferences for 2025?"
+        query = DEMO_TARGETED_QUERY
         response = model.generate_content(query)
         
-        print(f"\n📊 Targeted Query: {query}")
-        print("-" * 40)
-        print(response.text)
-        print("-" * 40)
+        if verbose:
+            sys.stdout.write(
+                f"\n📊 Targeted Query: {query}\n"
+                + SEPARATOR_40 + response.text + "\n" + SEPARATOR_40
+            )
+        else:
+            logger.info("📊 Targeted Query: %s (%d characters)", query, len(response.text))
         
         return True
         
@@ -112,11 +126,20 @@ def demo_targeted_query():
         return False
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Healthcare Conference Deep Research Tool Demo")
+    parser.add_argument("--verbose", action="store_true", help="print full research results")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    
     # Run the demo
-    success = demo_research_tool()
+    try:
+        success = demo_research_tool(args.verbose)
+    except RuntimeError:
+        sys.stdout.write(API_KEY_HELP)
+        success = False
     
     if success:
-        demo_targeted_query()
+        demo_targeted_query(args.verbose)
     
     print("\n🎉 Demo completed!")
     print("📖 Check the other research scripts:")
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Shared Gemini setup for the conference research scripts
+Configures the SDK and builds models once per process
+"""
+
+import functools
+import os
+from typing import Optional
+from dotenv import load_dotenv
+try:
+    import google.generativeai as genai
+except ImportError:
+    print("❌ Google Generative AI package not installed.")
+    print("Please install it with: pip install google-generativeai")
+    exit(1)
+
+# Load environment variables
+load_dotenv()
+
+MODEL_NAME = "gemini-1.5-pro"
+
+@functools.cache
+def require_api_key() -> str:
+    """Read the Gemini API key once and configure the SDK with it"""
+    api_key = os.getenv("GEMINI_API_KEY")
+    if not api_key:
+        raise RuntimeError("GEMINI_API_KEY not found in environment variables")
+    genai.configure(api_key=api_key)
+    return api_key
+
+@functools.lru_cache(maxsize=8)
+def get_model(system_instruction: Optional[str] = None):
+    """Return a shared Gemini model for the given system instruction"""
+    return genai.GenerativeModel(
+        model_name=MODEL_NAME,
+        system_instruction=system_instruction
+    )
@@ -0,0 +1,17 @@
+#!/usr/bin/env python3
+"""
+Shared event loop setup for the conference research scripts
+Kept free of the Gemini SDK so the API test script can use it too
+"""
+
+import sys
+
+def install_uvloop():
+    """Switch asyncio to uvloop when it is installed"""
+    if sys.platform == "win32":
+        return
+    try:
+        import uvloop
+    except ImportError:
+        return
+    uvloop.install()
@@ -0,0 +1,95 @@
+"""
+Tests for the targeted research batching and JSON parsing in conference_research.py
+"""
+
+import asyncio
+
+import pytest
+
+import conference_research
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeModel:
+    """Stands in for a Gemini model: batch prompts get batch_reply, single prompts echo their query"""
+
+    def __init__(self, batch_reply):
+        self.batch_reply = batch_reply
+        self.prompts = []
+
+    async def generate_content_async(self, prompt, stream=False, generation_config=None):
+        self.prompts.append(prompt)
+        if generation_config is not None:
+            return FakeResponse(self.batch_reply)
+        return FakeResponse("single: " + prompt.rsplit(": ", 1)[-1])
+
+
+@pytest.fixture
+def fake_model(monkeypatch, tmp_path):
+    model = FakeModel(batch_reply="")
+    monkeypatch.setattr(conference_research, "get_model", lambda system_instruction=None: model)
+    monkeypatch.setattr(conference_research, "require_api_key", lambda: "test-key")
+    monkeypatch.setattr(conference_research, "CACHE_DIR", tmp_path)
+    return model
+
+
+def run_batch(queries, use_cache=False):
+    return asyncio.run(conference_research.targeted_research_batch(queries, use_cache))
+
+
+def test_parse_research_json_strips_code_fences():
+    assert conference_research.parse_research_json('```json\n[{"name": "HIMSS"}]\n```\n') == [{"name": "HIMSS"}]
+
+
+def test_parse_research_json_returns_none_for_invalid_json():
+    assert conference_research.parse_research_json("HIMSS is in March") is None
+
+
+def test_batch_uses_json_object_answers(fake_model):
+    fake_model.batch_reply = '{"0": "HIMSS answer", "1": {"dates": "June"}}'
+
+    results = run_batch(["HIMSS 2025", "BIO 2025"])
+
+    assert results[0] == "HIMSS answer"
+    assert '"dates": "June"' in results[1]
+    assert len(fake_model.prompts) == 1
+
+
+def test_batch_falls_back_when_answer_is_an_array(fake_model):
+    fake_model.batch_reply = '["HIMSS answer", "BIO answer"]'
+
+    results = run_batch(["HIMSS 2025", "BIO 2025"])
+
+    assert results == {0: "single: HIMSS 2025", 1: "single: BIO 2025"}
+
+
+def test_batch_falls_back_when_answer_is_invalid_json(fake_model):
+    fake_model.batch_reply = "Sorry, here is some prose instead"
+
+    results = run_batch(["HIMSS 2025", "BIO 2025"])
+
+    assert results == {0: "single: HIMSS 2025", 1: "single: BIO 2025"}
+
+
+def test_batch_researches_only_the_missing_query_separately(fake_model):
+    fake_model.batch_reply = '```json\n{"0": "HIMSS answer"}\n```'
+
+    results = run_batch(["HIMSS 2025", "BIO 2025"])
+
+    assert results == {0: "HIMSS answer", 1: "single: BIO 2025"}
+    assert len(fake_model.prompts) == 2
+
+
+def test_batch_serves_all_cached_queries_without_calling_gemini(fake_model):
+    fake_model.batch_reply = '{"0": "HIMSS answer", "1": "BIO answer"}'
+    run_batch(["HIMSS 2025", "BIO 2025"])
+    fake_model.prompts.clear()
+
+    results = run_batch(["HIMSS 2025", "BIO 2025"], use_cache=True)
+
+    assert results == {0: "HIMSS answer", 1: "BIO answer"}
+    assert fake_model.prompts == []